@@ -1,138 +1,394 @@
 
+import re
+import ahocorasick
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from joblib import Parallel, delayed, effective_n_jobs
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import matplotlib
+matplotlib.use('Agg')  # charts are only ever saved, so skip interactive backend detection
 import matplotlib.pyplot as plt
-import seaborn as sns
+import io
+import multiprocessing
 import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from fpdf import FPDF
+from fpdf import FPDF, XPos, YPos
+
+try:
+    import hyperscan  # optional, x86-64 only: SIMD multi-pattern scanning for topic keywords
+except ImportError:
+    hyperscan = None
 
 # --- Global constants for reporting ---
 PDF_TITLE = "Resident Feedback Analysis: Q1-Q2 2025"
 REPORT_DATE = datetime.now().strftime("%B %d, %Y")
 CHART_DIR = 'reports/charts'
+REPORT_FONT = 'helvetica'  # fpdf2 core font; 'Arial' was re-resolved to it on every set_font call
+CHART_STYLE = 'seaborn-v0_8-whitegrid'
+CSV_BLOCK_BYTES = 16 << 20  # pyarrow streams the CSV in record batches of about this many bytes
+CSV_COLUMN_TYPES = {
+    'timestamp': pa.timestamp('s'),
+    'source': pa.dictionary(pa.int32(), pa.string()),
+    'feedback_text': pa.string(),
+}
+
+# --- Topic keyword rules, in priority order (first match wins) ---
+TOPIC_RULES = [
+    ('Parks, Rec & Library', ['park', 'playground', 'library', 'program', 'community center']),
+    ('Public Works - Sanitation', ['trash', 'recycling', 'pickup', 'sweeping']),
+    ('Public Works - Transportation', ['pothole', 'road', 'traffic', 'street', 'crosswalk']),
+    ('Community Development', ['zoning', 'permit', 'construction', 'license']),
+    ('Water Resources', ['bill', 'main break', 'quality', 'sewer']),
+    ('Public Safety', ['police', 'fire', 'officer', 'emergency']),
+    ('Code Enforcement', ['yard', 'noise', 'vehicle']),
+]
+DEFAULT_TOPIC = 'General Inquiry'
+TOPIC_DTYPE = pd.CategoricalDtype(sorted([topic for topic, _ in TOPIC_RULES] + [DEFAULT_TOPIC]))
+
+# A single fused alternation regex is not a substitute here: it reports the leftmost keyword,
+# not the highest-priority topic, and the lookahead form that fixes that rescans each string.
+def _build_topic_automaton():
+    """Builds one Aho-Corasick automaton mapping every keyword to its topic's priority."""
+    automaton = ahocorasick.Automaton()
+    for priority, (_, keywords) in enumerate(TOPIC_RULES):
+        for kw in keywords:
+            if kw not in automaton: automaton.add_word(kw, priority)
+    automaton.make_automaton()
+    return automaton
+
+TOPIC_AUTOMATON = _build_topic_automaton()
+
+def _build_topic_database():
+    """Compiles every keyword into one Hyperscan database whose match ids are topic priorities."""
+    if hyperscan is None:
+        return None, None
+    keywords = [(kw, priority) for priority, (_, kws) in enumerate(TOPIC_RULES) for kw in kws]
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[re.escape(kw).encode() for kw, _ in keywords],
+        ids=[priority for _, priority in keywords],
+        elements=len(keywords),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(keywords),
+    )
+    return database, hyperscan.Scratch(database)
+
+TOPIC_DATABASE, TOPIC_SCRATCH = _build_topic_database()
+
+# --- Sentiment scoring (VADER compound score thresholds) ---
+SENTIMENT_ANALYZER = SentimentIntensityAnalyzer()
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+SENTIMENT_N_JOBS = -1            # joblib worker count (-1 = all cores)
+PARALLEL_MIN_ROWS = 20000        # below this, process start-up costs more than it saves
+SENTIMENT_DTYPE = pd.CategoricalDtype(['Negative', 'Neutral', 'Positive'], ordered=True)
+
+# --- Background file writer for report artifacts ---
+class AsyncFileWriter:
+    """Writes (path, bytes) pairs to disk on a background thread so rendering never waits on I/O."""
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._error = None
+
+    def submit(self, path, data):
+        """Queues data to be written to path; the writer thread starts on first use."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, daemon=True)
+                self._thread.start()
+        self._queue.put((path, data))
+
+    def flush(self):
+        """Blocks until every queued file is on disk, re-raising the first error from the writer thread."""
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _drain(self):
+        while True:
+            path, data = self._queue.get()
+            try:
+                with open(path, 'wb') as f:
+                    f.write(data)
+            except Exception as e:
+                # Keep draining: a dead writer thread would leave flush() blocked on queue.join().
+                if self._error is None: self._error = e
+            finally:
+                self._queue.task_done()
+
+ASYNC_WRITER = AsyncFileWriter()
 
 # --- 1. DATA PROCESSING ---
-def load_and_process_data(filepath):
-    """Loads and processes the feedback data."""
+def _process_frame(df):
+    """Adds topic, sentiment and month (Int32 months since 1970-01, NA if undated) columns to a frame of raw feedback."""
+    # Score each distinct comment once; duplicates reuse the cached result. Missing text is kept
+    # as its own group (not the -1 sentinel, which take() would read as the last row).
+    codes, unique_texts = pd.factorize(df['feedback_text'], use_na_sentinel=False)
+    analyzed = analyze_feedback(pd.Series(unique_texts)).take(codes)
+    df['topic'] = analyzed['topic'].array
+    df['sentiment'] = analyzed['sentiment'].array
+    # NaT would otherwise cast to month 0 (1970-01); keep it as NA so monthly projections drop it.
+    months = df['timestamp'].to_numpy().astype('datetime64[M]')
+    missing = np.isnat(months)
+    codes = np.where(missing, 0, months.view(np.int64)).astype(np.int32)
+    df['month'] = pd.arrays.IntegerArray(codes, missing)
+    return df
+
+def month_starts(codes):
+    """Converts int32 month codes back to a DatetimeIndex of month starts for labelling."""
+    return pd.DatetimeIndex(np.asarray(codes, dtype=np.int32).astype('datetime64[M]'))
+
+def monthly_counts(cube):
+    """Comment volume per month, indexed by month start, with months that had no comments filled as 0."""
+    counts = cube.groupby(level='month', observed=True).sum()
+    if len(counts):
+        counts = counts.reindex(range(counts.index.min(), counts.index.max() + 1), fill_value=0)
+    counts.index = month_starts(counts.index)
+    return counts
+
+def summarize_feedback(df):
+    """Counts comments per (month, topic, sentiment) in one groupby; every report KPI projects out of this cube.
+
+    Undated rows stay in the cube under month NA; only the monthly projections drop them.
+    """
+    return df.groupby(['month', 'topic', 'sentiment'], observed=True, dropna=False).size()
+
+def stream_feedback_summary(filepath, block_size=CSV_BLOCK_BYTES):
+    """Builds the summary cube batch by batch, so memory stays bounded however large the CSV is."""
     try:
-        df = pd.read_csv(filepath)
+        reader = pa_csv.open_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(block_size=block_size),
+            # Blank text becomes NA rather than '', matching what read_csv produced.
+            convert_options=pa_csv.ConvertOptions(column_types=CSV_COLUMN_TYPES, strings_can_be_null=True),
+        )
     except FileNotFoundError:
         print(f"ERROR: Data file not found at '{filepath}'.")
         return None
 
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['topic'] = df['feedback_text'].apply(classify_topic)
-    df['sentiment'] = df['feedback_text'].apply(get_sentiment)
-    df['month'] = df['timestamp'].dt.to_period('M')
-    return df
+    # Timestamps arrive as NumPy datetime64 (NaT if blank), which _process_frame needs for month codes.
+    to_frame = {pa.string(): pd.StringDtype('pyarrow')}.get
+    with reader:
+        partial_cubes = [summarize_feedback(_process_frame(batch.to_pandas(types_mapper=to_frame)))
+                         for batch in reader]
+    return pd.concat(partial_cubes).groupby(level=['month', 'topic', 'sentiment'], observed=True, dropna=False).sum()
+
+def sentiment_crosstab(cube):
+    """Projects the summary cube onto a topic x sentiment table of comment counts."""
+    return cube.groupby(level=['topic', 'sentiment'], observed=True).sum().unstack(fill_value=0)
+
+def analyze_feedback(texts):
+    """Returns a DataFrame with the topic and sentiment of each text in a Series, as categoricals."""
+    return pd.DataFrame({
+        'topic': classify_topics(texts).astype(TOPIC_DTYPE),
+        'sentiment': classify_sentiments(texts),
+    })
+
+def classify_topics(texts):
+    """Classifies a Series of feedback into topics with one multi-keyword scan per text."""
+    return texts.map(_match_topic, na_action='ignore').fillna(DEFAULT_TOPIC)
+
+def _match_topic(text):
+    """Returns the highest-priority topic whose keywords appear in the text, ignoring case."""
+    if TOPIC_DATABASE is not None:
+        hits = []
+        TOPIC_DATABASE.scan(text.encode(), match_event_handler=_collect_topic_hit, context=hits, scratch=TOPIC_SCRATCH)
+        priority = min(hits, default=None)
+    else:
+        priority = min((p for _, p in TOPIC_AUTOMATON.iter(text.lower())), default=None)
+    return DEFAULT_TOPIC if priority is None else TOPIC_RULES[priority][0]
+
+def _collect_topic_hit(priority, start, end, flags, hits):
+    """Hyperscan match callback: records the matched topic priority."""
+    hits.append(priority)
 
 def classify_topic(text):
     """Classifies feedback into a department/topic using keyword matching."""
-    text = text.lower()
-    if any(kw in text for kw in ['park', 'playground', 'library', 'program', 'community center']): return 'Parks, Rec & Library'
-    if any(kw in text for kw in ['trash', 'recycling', 'pickup', 'sweeping']): return 'Public Works - Sanitation'
-    if any(kw in text for kw in ['pothole', 'road', 'traffic', 'street', 'crosswalk']): return 'Public Works - Transportation'
-    if any(kw in text for kw in ['zoning', 'permit', 'construction', 'license']): return 'Community Development'
-    if any(kw in text for kw in ['bill', 'main break', 'quality', 'sewer']): return 'Water Resources'
-    if any(kw in text for kw in ['police', 'fire', 'officer', 'emergency']): return 'Public Safety'
-    if any(kw in text for kw in ['yard', 'noise', 'vehicle']): return 'Code Enforcement'
-    return 'General Inquiry'
+    return _match_topic(text)
+
+def _score_chunk(texts):
+    """Returns VADER compound scores for a chunk of texts (runs inside joblib workers); missing text scores 0."""
+    return np.array([SENTIMENT_ANALYZER.polarity_scores(text)['compound'] if isinstance(text, str) else 0.0 for text in texts], dtype=float)
+
+def score_sentiments(texts):
+    """Computes compound scores for a Series, fanning out across processes for large inputs."""
+    values = texts.to_numpy()
+    n_jobs = effective_n_jobs(SENTIMENT_N_JOBS)
+    if len(values) < PARALLEL_MIN_ROWS or n_jobs == 1:
+        return _score_chunk(values)
+    chunks = np.array_split(values, n_jobs * 4)
+    return np.concatenate(Parallel(n_jobs=n_jobs)(delayed(_score_chunk)(chunk) for chunk in chunks))
+
+def classify_sentiments(texts):
+    """Scores a Series of feedback with VADER and thresholds the compound scores straight into categorical codes."""
+    scores = score_sentiments(texts)
+    # Branchless: 0 = Negative, 1 = Neutral, 2 = Positive, matching SENTIMENT_DTYPE's category order.
+    codes = 1 + (scores > POSITIVE_THRESHOLD).astype(np.int8) - (scores < NEGATIVE_THRESHOLD).astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=SENTIMENT_DTYPE), index=texts.index)
 
 def get_sentiment(text):
     """Analyzes the sentiment of a text string."""
-    polarity = TextBlob(text).sentiment.polarity
-    if polarity > 0.1: return 'Positive'
-    if polarity < -0.1: return 'Negative'
+    polarity = SENTIMENT_ANALYZER.polarity_scores(text)['compound']
+    if polarity > POSITIVE_THRESHOLD: return 'Positive'
+    if polarity < NEGATIVE_THRESHOLD: return 'Negative'
     return 'Neutral'
 
 # --- 2. VISUALIZATION ---
-def create_visualizations(df):
-    """Generates and saves all charts for the report."""
+def create_visualizations(cube, ct):
+    """Renders all charts for the report, queues them for writing, and returns their PNG bytes by path."""
+    return start_visualizations(cube, ct)()
+
+def start_visualizations(cube, ct):
+    """Starts rendering all charts and returns a function that waits for them, queues them for writing,
+    and returns their PNG bytes by path."""
     os.makedirs(CHART_DIR, exist_ok=True)
-    plt.style.use('seaborn-v0_8-whitegrid')
-
-    # Chart 1: Comment Volume by Topic
-    plt.figure(figsize=(10, 6))
-    topic_counts = df['topic'].value_counts()
-    sns.barplot(x=topic_counts.values, y=topic_counts.index, palette='viridis', hue=topic_counts.index, dodge=False, legend=False)
-    plt.title('Total Feedback Volume by Department', fontsize=16)
-    plt.xlabel('Number of Comments')
-    plt.ylabel('')
-    plt.tight_layout()
-    plt.savefig(f'{CHART_DIR}/volume_by_topic.png')
-    plt.close()
-
-    # Chart 2: Sentiment Breakdown
-    plt.figure(figsize=(10, 6))
-    sentiment_by_topic = df.groupby('topic')['sentiment'].value_counts(normalize=True).unstack().fillna(0)
-    sentiment_by_topic.plot(kind='barh', stacked=True, figsize=(10, 8), color=sns.color_palette("RdYlGn", 3))
-    plt.title('Sentiment Breakdown by Department', fontsize=16)
-    plt.xlabel('Proportion of Comments')
-    plt.ylabel('')
-    plt.legend(title='Sentiment', bbox_to_anchor=(1.02, 1), loc='upper left')
-    plt.tight_layout()
-    plt.savefig(f'{CHART_DIR}/sentiment_breakdown.png')
-    plt.close()
-
-    # Chart 3: Time Series of Comment Volume
-    plt.figure(figsize=(12, 6))
-    monthly_comments = df.set_index('timestamp')['feedback_text'].resample('M').count()
-    monthly_comments.plot(kind='line', marker='o')
-    plt.title('Monthly Feedback Volume (All Topics)', fontsize=16)
-    plt.xlabel('Month')
-    plt.ylabel('Number of Comments')
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig(f'{CHART_DIR}/volume_timeseries.png')
-    plt.close()
+
+    # Pre-aggregate in the parent so each worker only receives a small table.
+    topic_counts = cube.groupby(level='topic', observed=True).sum().sort_values(ascending=False)
+    sentiment_by_topic = ct.div(ct.sum(axis=1), axis=0)
+    monthly_comments = monthly_counts(cube)
+
+    jobs = [
+        (_chart_volume_by_topic, topic_counts, (10, 6), f'{CHART_DIR}/volume_by_topic.png'),
+        (_chart_sentiment_breakdown, sentiment_by_topic, (10, 8), f'{CHART_DIR}/sentiment_breakdown.png'),
+        (_chart_volume_timeseries, monthly_comments, (12, 6), f'{CHART_DIR}/volume_timeseries.png'),
+    ]
+    if _usable_cpus() > 1:
+        # pandas/pyarrow already run native threads, so never fork this process for the pool.
+        executor = ProcessPoolExecutor(max_workers=len(jobs), mp_context=_pool_context())
+        futures = [executor.submit(_render_chart, job) for job in jobs]
+        def collect():
+            with executor:
+                return dict(future.result() for future in futures)
+    else:
+        # A pool cannot run in parallel on one core; render in-process and reuse a single Figure.
+        with plt.style.context(CHART_STYLE):
+            fig = plt.figure()
+            rendered = dict(_render_chart(job, fig) for job in jobs)
+            plt.close(fig)
+        collect = lambda: rendered
+
+    def finish():
+        charts = collect()
+        for path, png in charts.items():
+            ASYNC_WRITER.submit(path, png)
+        return charts
+    return finish
+
+def _pool_context():
+    """Returns a non-fork multiprocessing context: forkserver where the OS supports it, else spawn."""
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+def _usable_cpus():
+    """Returns how many CPUs this process may run on, honouring affinity masks where the OS exposes them."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _render_chart(job, fig=None):
+    """Draws one chart onto fig (a fresh Figure if none is given) and returns its path and PNG bytes."""
+    draw, data, figsize, path = job
+    owns_fig = fig is None
+    if owns_fig:
+        plt.style.use(CHART_STYLE)
+        fig = plt.figure()
+    fig.clf()
+    fig.set_size_inches(figsize)
+    draw(fig.add_subplot(), data)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    if owns_fig:
+        plt.close(fig)
+    return path, buf.getvalue()
+
+def _palette(cmap, n):
+    """Samples n evenly spaced interior colors from a colormap (same spacing as seaborn's palettes)."""
+    return cmap(np.linspace(0, 1, n + 2)[1:-1])
+
+def _chart_volume_by_topic(ax, topic_counts):
+    """Chart 1: Comment Volume by Topic."""
+    ax.barh(topic_counts.index.astype(str), topic_counts.values, color=_palette(plt.cm.viridis, len(topic_counts)))
+    ax.invert_yaxis()
+    ax.yaxis.grid(False)
+    ax.set_title('Total Feedback Volume by Department', fontsize=16)
+    ax.set_xlabel('Number of Comments')
+    ax.set_ylabel('')
+
+def _chart_sentiment_breakdown(ax, sentiment_by_topic):
+    """Chart 2: Sentiment Breakdown."""
+    topics = sentiment_by_topic.index.astype(str)
+    left = np.zeros(len(sentiment_by_topic))
+    for sentiment, color in zip(sentiment_by_topic.columns, _palette(plt.cm.RdYlGn, 3)):
+        shares = sentiment_by_topic[sentiment].to_numpy()
+        ax.barh(topics, shares, left=left, height=0.5, color=color, label=sentiment)
+        left += shares
+    ax.set_title('Sentiment Breakdown by Department', fontsize=16)
+    ax.set_xlabel('Proportion of Comments')
+    ax.set_ylabel('')
+    ax.legend(title='Sentiment', bbox_to_anchor=(1.02, 1), loc='upper left')
+
+def _chart_volume_timeseries(ax, monthly_comments):
+    """Chart 3: Time Series of Comment Volume."""
+    monthly_comments.plot(kind='line', marker='o', ax=ax)
+    ax.set_title('Monthly Feedback Volume (All Topics)', fontsize=16)
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Number of Comments')
+    ax.grid(True)
 
 # --- 3. PDF REPORTING ---
 class PDF(FPDF):
     def header(self):
-        self.set_font('Arial', 'B', 16)
-        self.cell(0, 10, PDF_TITLE, 0, 1, 'C')
-        self.set_font('Arial', '', 10)
-        self.cell(0, 10, f'Report Generated: {REPORT_DATE}', 0, 1, 'C')
+        self.set_font(REPORT_FONT, 'B', 16)
+        self.cell(0, 10, PDF_TITLE, align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_font(REPORT_FONT, '', 10)
+        self.cell(0, 10, f'Report Generated: {REPORT_DATE}', align='C', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         self.ln(10)
 
     def footer(self):
         self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+        self.set_font(REPORT_FONT, 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', align='C')
 
     def chapter_title(self, title):
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, title, 0, 1, 'L')
+        self.set_font(REPORT_FONT, 'B', 14)
+        self.cell(0, 10, title, align='L', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         self.ln(4)
 
     def chapter_body(self, text):
-        self.set_font('Arial', '', 11)
+        self.set_font(REPORT_FONT, '', 11)
         self.multi_cell(0, 5, text)
         self.ln()
 
-    def add_image(self, path, width_percent=0.8):
+    def add_image(self, image, width_percent=0.8):
         page_width = self.w - 2 * self.l_margin
         img_width = page_width * width_percent
-        self.image(path, x=self.get_x() + (page_width - img_width)/2, w=img_width)
+        self.image(image, x=self.get_x() + (page_width - img_width)/2, w=img_width)
         self.ln(5)
 
-def generate_executive_summary(df):
-    """Generates the text for the executive summary and recommendations."""
-    total_comments = len(df)
+def generate_executive_summary(cube, ct):
+    """Generates the text for the executive summary and recommendations from the summary cube and crosstab."""
+    total_comments = cube.sum()
 
     # Key Findings
-    topic_counts = df['topic'].value_counts()
+    topic_counts = cube.groupby(level='topic', observed=True).sum().sort_values(ascending=False)
     most_common_topic = topic_counts.index[0]
 
-    sentiment_counts = df['sentiment'].value_counts(normalize=True) * 100
+    sentiment_counts = cube.groupby(level='sentiment', observed=True).sum() / total_comments * 100
     overall_positive = sentiment_counts.get('Positive', 0)
 
-    neg_sentiment_by_topic = df[df['sentiment'] == 'Negative']['topic'].value_counts()
-    worst_topic = neg_sentiment_by_topic.index[0]
-    worst_topic_count = neg_sentiment_by_topic.iloc[0]
+    worst_topic = ct['Negative'].idxmax()
+    worst_topic_count = ct['Negative'].max()
 
-    monthly_volume = df.set_index('timestamp').resample('M').size()
+    monthly_volume = monthly_counts(cube)
     peak_month = monthly_volume.idxmax().strftime('%B')
 
     findings = f"""This report analyzes {total_comments} resident comments received between Jan 1 and Jun 30, 2025. The overall sentiment was {overall_positive:.1f}% positive.
@@ -162,8 +418,8 @@ def generate_executive_summary(df):
 """
     return findings, recommendations
 
-def create_pdf_report(df, findings, recommendations):
-    """Assembles the final PDF report."""
+def create_pdf_report(findings, recommendations, charts):
+    """Assembles the final PDF report from in-memory chart PNGs and queues it for writing."""
     pdf = PDF()
     pdf.add_page()
 
@@ -180,12 +436,11 @@ def create_pdf_report(df, findings, recommendations):
     pdf.chapter_title('3. Visual Analysis')
     pdf.chapter_body('The following charts provide a visual breakdown of the feedback data.')
 
-    pdf.add_image(f'{CHART_DIR}/volume_by_topic.png', 0.9)
-    pdf.add_image(f'{CHART_DIR}/sentiment_breakdown.png', 0.9)
-    pdf.add_image(f'{CHART_DIR}/volume_timeseries.png', 0.9)
+    for png in charts.values():
+        pdf.add_image(io.BytesIO(png), 0.9)
 
     report_path = 'reports/Executive_Summary.pdf'
-    pdf.output(report_path)
+    ASYNC_WRITER.submit(report_path, bytes(pdf.output()))
     return report_path
 
 # --- 4. MAIN EXECUTION ---
@@ -193,19 +448,25 @@ def main():
     """Main function to run the full analysis and reporting pipeline."""
     print("--- Starting Resident Feedback Analysis Pipeline ---")
 
-    df = load_and_process_data('sample_feedback.csv')
-    if df is None:
+    cube = stream_feedback_summary('sample_feedback.csv')
+    if cube is None:
         return
 
+    ct = sentiment_crosstab(cube)
     print("Step 1: Data processed successfully.")
 
-    create_visualizations(df)
+    # Charts render in worker processes while the summary text is generated here.
+    finish_charts = start_visualizations(cube, ct)
+    try:
+        findings, recommendations = generate_executive_summary(cube, ct)
+    finally:
+        # Always collect, so the worker pool is shut down even if the summary step fails.
+        charts = finish_charts()
     print("Step 2: Visualizations created.")
-
-    findings, recommendations = generate_executive_summary(df)
     print("Step 3: Insights and recommendations generated.")
 
-    report_path = create_pdf_report(df, findings, recommendations)
+    report_path = create_pdf_report(findings, recommendations, charts)
+    ASYNC_WRITER.flush()
     print(f"Step 4: PDF report compiled successfully.")
 
     print(f"\n--- Pipeline Complete. Open '{report_path}' to view the summary. ---")